@@ -4,8 +4,11 @@ import numpy as np
 from datetime import datetime
 from helpers import (
     calculate_bmr, get_activity_multiplier, adjust_calories_for_goal,
-    filter_meals, scale_day_to_target
+    filter_meals, scale_day_to_target, filter_household_meals, pick_week_plan,
+    household_portions, protein_target_g, fat_target_g, minutes_for_burn, METS, MEALS
 )
+import memstats
+from dish_index import DishIndex
 
 st.set_page_config(page_title="Indian Meal Planner", layout="wide")
 st.title("🍛 Indian Meal Planner")
@@ -13,15 +16,6 @@ st.title("🍛 Indian Meal Planner")
 # =========================
 # Shared helpers (Diet page)
 # =========================
-def protein_target_g(weight_kg: float, goal: str) -> float:
-    g = goal.lower()
-    if g == "loss":   return round(2.0 * weight_kg, 1)
-    if g == "gain":   return round(2.2 * weight_kg, 1)
-    return round(1.8 * weight_kg, 1)
-
-def fat_target_g(target_kcal: float) -> float:
-    return round((target_kcal * 0.27) / 9.0, 1)
-
 def bmi_category(bmi: float) -> str:
     if bmi < 18.5: return "Underweight"
     if bmi < 25:   return "Normal"
@@ -82,17 +76,23 @@ def sleep_reco_hours(age: int) -> str:
     if age < 65: return "7–9 h"
     return "7–8 h"
 
-METS = {"Brisk walk": 4.3, "Jogging": 7.0, "Cycling (moderate)": 6.0}
-def minutes_for_burn(target_kcal: float, weight_kg: float, met: float) -> int:
-    if target_kcal <= 0: return 0
-    kcal_per_min = met * 3.5 * weight_kg / 200.0
-    mins = int(np.ceil(target_kcal / max(kcal_per_min, 1e-6)))
-    return int(np.ceil(mins/5)*5)
+@st.cache_resource
+def dish_index() -> DishIndex:
+    # Built once per process and shared by all sessions
+    return DishIndex(pd.read_csv("meals.csv"))
+
+SWAP_LIMIT = 50
 
 # =========================
 # Mode switch
 # =========================
-mode = st.sidebar.radio("Mode", ["Diet Plan", "Workout Plan"], index=0)
+mode = st.sidebar.radio("Mode", ["Diet Plan", "Workout Plan", "Household Plan"], index=0)
+
+# Memory debug panel (opt-in via MEALPLANNER_MEMDEBUG=1); drawn before the mode
+# branches so st.stop() can't hide it. Diffs from this rerun show on the next one.
+if memstats.ENABLED:
+    # Per-rerun catalog frame plus the process-wide cached index
+    memstats.render_panel(st.session_state, {"meals.csv": pd.read_csv("meals.csv"), "DishIndex (shared)": dish_index()})
 
 # ======================================================
 # ===============  MODE 1: DIET PLAN  ==================
@@ -169,20 +169,21 @@ if mode == "Diet Plan":
             week.append(day_plan)
         return week
 
+    conditions = {"diabetes":"Diabetes" in conds, "bp":"High BP" in conds, "cholesterol":"High Cholesterol" in conds}
     current_hash = hash_params()
     if btn_generate or (not st.session_state.plan_ready) or (st.session_state.params_hash != current_hash):
-        conditions = {"diabetes":"Diabetes" in conds, "bp":"High BP" in conds, "cholesterol":"High Cholesterol" in conds}
-        filt = filter_meals(df, region, diet, conditions)
-        if filt.empty:
-            st.error("No meals match your filters. Try relaxing health conditions or change region/diet.")
-            st.stop()
-        N = 7 if plan_len == "7-day" else 3
-        st.session_state.filtered_df = filt.reset_index(drop=True)
-        st.session_state.raw_week   = build_initial_plan(st.session_state.filtered_df, N)
-        st.session_state.N_days     = N
-        st.session_state.if_days_set = set(if_days)
-        st.session_state.plan_ready = True
-        st.session_state.params_hash = current_hash
+        with memstats.traced("generate plan"):
+            filt = filter_meals(df, region, diet, conditions)
+            if filt.empty:
+                st.error("No meals match your filters. Try relaxing health conditions or change region/diet.")
+                st.stop()
+            N = 7 if plan_len == "7-day" else 3
+            st.session_state.filtered_df = filt.reset_index(drop=True)
+            st.session_state.raw_week   = build_initial_plan(st.session_state.filtered_df, N)
+            st.session_state.N_days     = N
+            st.session_state.if_days_set = set(if_days)
+            st.session_state.plan_ready = True
+            st.session_state.params_hash = current_hash
     else:
         st.session_state.if_days_set = set(if_days)
 
@@ -255,15 +256,21 @@ if mode == "Diet Plan":
                 else:
                     current_name = st.session_state.raw_week[i][meal_to_swap]["Dish"]
                     st.caption(f"Current: **{current_name}**")
-                    alt_df = st.session_state.filtered_df
-                    alts = alt_df[(alt_df["MealType"]==meal_to_swap) & (alt_df["Dish"] != current_name)]
-                    if alts.empty:
-                        st.info("No alternatives available for this meal.")
+                    q = st.text_input("Search dishes", key=f"swap_q_{i}", placeholder="Type to filter, e.g. dal, idli")
+                    alt_names = dish_index().query(
+                        q, meal_type=meal_to_swap, region=region, diet=diet,
+                        conditions=conditions, exclude={current_name}, limit=SWAP_LIMIT+1
+                    )
+                    if not alt_names:
+                        st.info("No alternatives match." if q else "No alternatives available for this meal.")
                     else:
-                        alt_names = alts["Dish"].unique().tolist()
+                        if len(alt_names) > SWAP_LIMIT:
+                            alt_names = alt_names[:SWAP_LIMIT]
+                            st.caption(f"Showing first {SWAP_LIMIT} matches — type to narrow.")
                         alt_choice = st.selectbox("Choose alternative", alt_names, key=f"alt_name_{i}")
                         if st.button(f"Swap {meal_to_swap} on Day {i+1}", key=f"swap_btn_{i}"):
-                            new_row = alts[alts["Dish"]==alt_choice].iloc[0]
+                            alt_df = st.session_state.filtered_df
+                            new_row = alt_df[(alt_df["MealType"]==meal_to_swap) & (alt_df["Dish"]==alt_choice)].iloc[0]
                             old = st.session_state.raw_week[i][meal_to_swap]["Dish"]
                             # update raw plan in-place
                             st.session_state.raw_week[i][meal_to_swap] = new_row
@@ -286,13 +293,15 @@ if mode == "Diet Plan":
         # Dashboard + export
         st.markdown("### 📊 Daily Calories")
         st.line_chart(pd.Series(cal_series, name="Calories"))
-        out_df = pd.DataFrame(rows_out)
-        st.download_button("⬇️ Download Diet Plan (CSV)", out_df.to_csv(index=False).encode(), "diet_plan.csv", "text/csv")
+        with memstats.traced("build CSV"):
+            out_df = pd.DataFrame(rows_out)
+            csv_bytes = out_df.to_csv(index=False).encode()
+        st.download_button("⬇️ Download Diet Plan (CSV)", csv_bytes, "diet_plan.csv", "text/csv")
 
 # ======================================================
 # ============  MODE 2: WORKOUT PLAN  ==================
 # ======================================================
-else:
+elif mode == "Workout Plan":
     st.subheader("🏋️ Fitness Exercise Planner")
 
     # Sidebar config
@@ -429,3 +438,112 @@ else:
             session_table(day_title, exs, include_core)
 
     st.caption("Sets/reps/rest auto-adjust with your level. Progress weekly: add reps or weight while keeping 1–2 RIR.")
+
+# ======================================================
+# ===========  MODE 3: HOUSEHOLD PLAN  =================
+# ======================================================
+else:
+    st.subheader("👪 Household Plan")
+    st.caption("One shared menu for the family; each member gets their own portions, protein/fat top-ups and burn minutes.")
+
+    with st.sidebar:
+        st.header("Household")
+        hh_region = st.selectbox("Region", ["North","South","East","West"], key="hh_region")
+        hh_len = st.selectbox("Plan length", ["7-day","3-day"], key="hh_len")
+        hh_if_days = st.multiselect("Intermittent Fasting (16:8): IF day(s) to skip breakfast", [1,2,3,4,5,6,7], default=[], key="hh_if")
+        hh_generate = st.button("Generate / Refresh household plan")
+
+    ACTIVITIES = ["Sedentary","Light","Moderate","Active","Very active"]
+    members_df = st.data_editor(
+        pd.DataFrame([
+            {"Name": "Member 1", "Age": 35, "Gender": "Male", "Weight (kg)": 75.0, "Height (cm)": 172.0,
+             "Activity": "Moderate", "Goal": "Maintain", "Diet": "Non-Veg",
+             "Diabetes": False, "High BP": False, "High Cholesterol": False},
+            {"Name": "Member 2", "Age": 33, "Gender": "Female", "Weight (kg)": 62.0, "Height (cm)": 160.0,
+             "Activity": "Light", "Goal": "Loss", "Diet": "Veg",
+             "Diabetes": False, "High BP": False, "High Cholesterol": False},
+        ]),
+        num_rows="dynamic", use_container_width=True, key="hh_members",
+        column_config={
+            "Age": st.column_config.NumberColumn(min_value=10, max_value=100, step=1),
+            "Gender": st.column_config.SelectboxColumn(options=["Male","Female"], required=True),
+            "Weight (kg)": st.column_config.NumberColumn(min_value=30.0, max_value=200.0),
+            "Height (cm)": st.column_config.NumberColumn(min_value=120.0, max_value=220.0),
+            "Activity": st.column_config.SelectboxColumn(options=ACTIVITIES, required=True),
+            "Goal": st.column_config.SelectboxColumn(options=["Maintain","Loss","Gain"], required=True),
+            "Diet": st.column_config.SelectboxColumn(options=["Veg","Non-Veg","Jain","Vegan"], required=True),
+        },
+    ).dropna(subset=["Age","Gender","Weight (kg)","Height (cm)","Activity","Goal","Diet"])
+    if members_df.empty:
+        st.info("Add at least one household member.")
+        st.stop()
+
+    members = []
+    for _, r in members_df.iterrows():
+        w = float(r["Weight (kg)"])
+        bmr_m = calculate_bmr(w, float(r["Height (cm)"]), int(r["Age"]), r["Gender"])
+        tgt = adjust_calories_for_goal(bmr_m * get_activity_multiplier(r["Activity"]), r["Goal"])
+        members.append({
+            "name": r["Name"] if isinstance(r["Name"], str) and r["Name"] else f"Member {len(members)+1}",
+            "diet": r["Diet"], "goal": r["Goal"], "weight": w, "target": tgt,
+            "ptarget": protein_target_g(w, r["Goal"]), "ftarget": fat_target_g(tgt),
+            "conditions": {"diabetes": bool(r["Diabetes"]), "bp": bool(r["High BP"]), "cholesterol": bool(r["High Cholesterol"])},
+        })
+
+    df = pd.read_csv("meals.csv")
+    hh_hash = (hh_region, hh_len, tuple(sorted({m["diet"] for m in members})),
+               tuple(sorted(k for m in members for k, v in m["conditions"].items() if v)))
+    if hh_generate or st.session_state.get("hh_params_hash") != hh_hash:
+        filt = filter_household_meals(df, hh_region, [m["diet"] for m in members], [m["conditions"] for m in members])
+        try:
+            with memstats.traced("generate household plan"):
+                week = pick_week_plan(filt, None)[:7 if hh_len == "7-day" else 3]
+        except ValueError:
+            st.error("No shared menu fits every member's diet and conditions. Try relaxing conditions or change region.")
+            st.stop()
+        st.session_state.hh_week = week
+        st.session_state.hh_params_hash = hh_hash
+    week = st.session_state.hh_week
+
+    # All members x days x meals in one pass
+    res = household_portions(week, members, if_days=hh_if_days)
+
+    st.markdown("---")
+    for d, day in enumerate(week):
+        is_if = (d+1) in hh_if_days
+        st.subheader(f"Day {d+1}" + (" (IF day — breakfast skipped)" if is_if else ""))
+        st.dataframe(pd.DataFrame([{
+            "Meal": m,
+            "Dish": "Skip (IF 16:8)" if (is_if and m == "Breakfast") else day[m]["Dish"],
+            "Base portion": "—" if (is_if and m == "Breakfast") else portion_suggestion(day[m]["Dish"]),
+            "Calories": 0 if (is_if and m == "Breakfast") else day[m]["Calories"],
+        } for m in MEALS]), use_container_width=True)
+        st.dataframe(pd.DataFrame({
+            "Member": [m["name"] for m in members],
+            "Target": [round(m["target"]) for m in members],
+            "kcal": res["kcal"][:, d].round(0),
+            "Dinner ×": res["factor"][:, d, 2].round(2),
+            "Snack ×": res["factor"][:, d, 3].round(2),
+            "Protein scoops": res["shakes"][:, d],
+            "Scoop kcal": res["shake_kcal"][:, d],
+            "Add fat (g)": res["fat_deficit"][:, d],
+            "Walk (min)": res["burn"]["Brisk walk"][:, d],
+            "Jog (min)": res["burn"]["Jogging"][:, d],
+            "Cycle (min)": res["burn"]["Cycling (moderate)"][:, d],
+        }), use_container_width=True)
+
+    # Export: one row per member x day x meal
+    with memstats.traced("build household CSV"):
+        N, D, M = res["factor"].shape
+        mac = res["macros"].reshape(N*D*M, 4)
+        out_df = pd.DataFrame({
+            "Member": np.repeat([m["name"] for m in members], D*M),
+            "Day": np.tile(np.repeat(np.arange(1, D+1), M), N),
+            "Meal": np.tile(MEALS, N*D),
+            "Dish": np.tile(["Skip (IF 16:8)" if ((d+1) in hh_if_days and m == "Breakfast") else day[m]["Dish"]
+                             for d, day in enumerate(week) for m in MEALS], N),
+            "Portion ×": res["factor"].reshape(-1).round(2),
+            "Calories": mac[:, 0], "Protein (g)": mac[:, 1], "Carbs (g)": mac[:, 2], "Fat (g)": mac[:, 3],
+        })
+        csv_bytes = out_df.to_csv(index=False).encode()
+    st.download_button("⬇️ Download Household Plan (CSV)", csv_bytes, "household_plan.csv", "text/csv")
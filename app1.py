@@ -3,6 +3,7 @@ import pandas as pd
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 import io
+import memstats
 
 # ------------------------------
 # BMR & TDEE Calculation
@@ -191,9 +192,15 @@ if submitted:
     df = pd.DataFrame(df_list)
 
     # CSV Download
-    csv = df.to_csv(index=False).encode()
+    with memstats.traced("build CSV"):
+        csv = df.to_csv(index=False).encode()
     st.download_button("Download as CSV", csv, "meal_plan.csv", "text/csv")
 
     # PDF Download
-    pdf_buffer = create_pdf(meal_plan)
+    with memstats.traced("create_pdf"):
+        pdf_buffer = create_pdf(meal_plan)
     st.download_button("Download as PDF", pdf_buffer, "meal_plan.pdf", "application/pdf")
+
+# Memory debug panel (opt-in via MEALPLANNER_MEMDEBUG=1)
+if memstats.ENABLED:
+    memstats.render_panel(st.session_state, {"meal_plans": meal_plans})
@@ -0,0 +1,98 @@
+import re
+import numpy as np
+import pandas as pd
+
+MAX_PREFIX = 12
+# Same tag keys that helpers.filter_conditions excludes on
+CONDITION_TAGS = {"diabetes": "highgi", "bp": "highsodium", "cholesterol": "highsatfat"}
+
+def normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", str(text).lower()).strip()
+
+def tokens(text: str) -> list:
+    return normalize(text).split()
+
+def trigrams(text: str) -> set:
+    grams = set()
+    for tok in tokens(text):
+        padded = f" {tok} "
+        grams.update(padded[i:i+3] for i in range(len(padded) - 2))
+    return grams
+
+class DishIndex:
+    # Prebuilt prefix + trigram postings over catalog dishes for ranked type-ahead.
+    # Build once per catalog (e.g. st.cache_resource); query() only touches the
+    # posting arrays for the typed grams, never the full frame.
+
+    def __init__(self, catalog: pd.DataFrame):
+        cols = ["Dish", "MealType", "Region", "Diet", "Tags"]
+        rows = catalog[cols].drop_duplicates(["Dish", "MealType", "Region", "Diet"])
+        rows = rows.sort_values("Dish", kind="stable").reset_index(drop=True)
+        self.names = rows["Dish"].astype(str).tolist()
+        self.n = len(self.names)
+
+        # Facet masks: value -> bool array over entries
+        self._facets = {}
+        for col in ["MealType", "Region", "Diet"]:
+            values = rows[col].astype(str).to_numpy()
+            self._facets[col] = {v: values == v for v in np.unique(values)}
+        tags = rows["Tags"].astype(str).str.lower()
+        self._blocked = {k: tags.str.contains(t, regex=False).to_numpy() for k, t in CONDITION_TAGS.items()}
+
+        prefix, lead, grams = {}, {}, {}
+        for i, name in enumerate(self.names):
+            for j, tok in enumerate(tokens(name)):
+                for L in range(1, min(len(tok), MAX_PREFIX) + 1):
+                    prefix.setdefault(tok[:L], set()).add(i)
+                    if j == 0:
+                        lead.setdefault(tok[:L], set()).add(i)
+            for g in trigrams(name):
+                grams.setdefault(g, set()).add(i)
+        self._prefix = {k: np.fromiter(sorted(v), dtype=np.int32) for k, v in prefix.items()}
+        self._lead = {k: np.fromiter(sorted(v), dtype=np.int32) for k, v in lead.items()}
+        self._grams = {k: np.fromiter(sorted(v), dtype=np.int32) for k, v in grams.items()}
+
+    def mask(self, meal_type=None, region=None, diet=None, conditions=None) -> np.ndarray:
+        m = np.ones(self.n, dtype=bool)
+        for col, val in (("MealType", meal_type), ("Region", region), ("Diet", diet)):
+            if val is not None:
+                m &= self._facets[col].get(val, np.zeros(self.n, dtype=bool))
+        for k, on in (conditions or {}).items():
+            if on and k in self._blocked:
+                m &= ~self._blocked[k]
+        return m
+
+    def query(self, q: str = "", meal_type=None, region=None, diet=None, conditions=None,
+              exclude=(), limit: int = 50, min_score: float = 0.5) -> list:
+        m = self.mask(meal_type, region, diet, conditions)
+        q_tokens = tokens(q)
+        if not q_tokens:
+            ids = np.flatnonzero(m)  # already alphabetical
+        else:
+            score = np.zeros(self.n, dtype=np.float32)
+            # Prefix hits dominate; trigram overlap adds typo tolerance
+            for tok in q_tokens:
+                hit = self._prefix.get(tok[:MAX_PREFIX])
+                if hit is not None:
+                    score[hit] += 1.0
+            # Names that start with the first typed word rank first
+            hit = self._lead.get(q_tokens[0][:MAX_PREFIX])
+            if hit is not None:
+                score[hit] += 0.5
+            q_grams = trigrams(q)
+            for g in q_grams:
+                hit = self._grams.get(g)
+                if hit is not None:
+                    score[hit] += 1.0 / len(q_grams)
+            score[~m] = 0
+            ids = np.flatnonzero(score >= min_score)
+            ids = ids[np.argsort(-score[ids], kind="stable")]
+        out = {}
+        skip = set(exclude)
+        for i in ids:
+            name = self.names[i]
+            if name not in skip:
+                out[name] = None
+                if len(out) >= limit:
+                    break
+        return list(out)
@@ -37,6 +37,32 @@ def filter_meals(df, region, diet, conditions):
     sub = sub[sub.apply(lambda r: filter_conditions(r, conditions), axis=1)]
     return sub
 
+# Diets whose dishes a member of each diet can eat (Non-Veg eats veg dishes, etc.)
+DIET_ALLOWS = {
+    "Non-Veg": {"Non-Veg","Veg","Jain","Vegan"},
+    "Veg": {"Veg","Jain","Vegan"},
+    "Jain": {"Jain"},
+    "Vegan": {"Vegan"},
+}
+DIET_STRICTNESS = ["Vegan","Jain","Veg","Non-Veg"]
+
+def household_diet(diets):
+    # Least restrictive diet every member can eat, or None (e.g. Jain + Vegan)
+    allowed = set.intersection(*(DIET_ALLOWS.get(d, {d}) for d in set(diets)))
+    for d in reversed(DIET_STRICTNESS):
+        if d in allowed and d in diets:
+            return d
+    return None
+
+def filter_household_meals(df, region, diets, conditions_list):
+    # One catalog every member can eat: the shared diet's own rows (same macros as
+    # a single-person plan) with health conditions combined across members
+    conditions = {k: any(c.get(k) for c in conditions_list) for k in ["diabetes","bp","cholesterol"]}
+    diet = household_diet(diets)
+    if diet is None:
+        return df.iloc[0:0]
+    return filter_meals(df, region, diet, conditions)
+
 def pick_week_plan(filtered_df, target_cal):
     # Build day-wise picks: Breakfast, Lunch, Dinner, Snack per day
     week = []
@@ -93,3 +119,79 @@ def build_shopping_list(week_plan):
             key = name.split()[0]
             inv[key] = inv.get(key,0) + 1
     return sorted(inv.items(), key=lambda x: -x[1])
+
+METS = {"Brisk walk": 4.3, "Jogging": 7.0, "Cycling (moderate)": 6.0}
+def minutes_for_burn(target_kcal, weight_kg, met):
+    # Works on scalars or numpy arrays (rounded up to the next 5 min)
+    kcal = np.asarray(target_kcal, dtype=float)
+    kcal_per_min = met * 3.5 * np.asarray(weight_kg, dtype=float) / 200.0
+    mins = np.ceil(kcal / np.maximum(kcal_per_min, 1e-6))
+    mins = np.where(kcal <= 0, 0, np.ceil(mins/5)*5).astype(int)
+    return int(mins) if mins.ndim == 0 else mins
+
+def protein_target_g(weight_kg: float, goal: str) -> float:
+    g = goal.lower()
+    if g == "loss":   return round(2.0 * weight_kg, 1)
+    if g == "gain":   return round(2.2 * weight_kg, 1)
+    return round(1.8 * weight_kg, 1)
+
+def fat_target_g(target_kcal: float) -> float:
+    return round((target_kcal * 0.27) / 9.0, 1)
+
+MEALS = ["Breakfast","Lunch","Dinner","Snack"]
+
+def household_portions(week_plan, members, if_days=()):
+    # One shared menu, every member's portions at once as member x day x meal arrays.
+    # members: dicts with target, ptarget, ftarget, weight, goal.
+    # Same rules as scale_day_to_target: scale Snack, then Dinner, to hit ±50.
+    D = len(week_plan)
+    # base[d, m, k] with k = cal, p, c, f
+    base = np.array([[[float(day[m][k]) for k in ["Calories","Protein","Carbs","Fat"]] for m in MEALS]
+                     for day in week_plan]).reshape(D, len(MEALS), 4)
+    for d in if_days:
+        if 1 <= d <= D:
+            base[d-1, 0, :] = 0.0
+    T = np.array([mb["target"] for mb in members], dtype=float)[:, None]      # (N,1)
+    P = np.array([mb["ptarget"] for mb in members], dtype=float)[:, None]
+    F = np.array([mb["ftarget"] for mb in members], dtype=float)[:, None]
+    W = np.array([mb["weight"] for mb in members], dtype=float)[:, None]
+    gain = np.array([mb["goal"] == "Gain" for mb in members])[:, None]
+    N = len(members)
+
+    factor = np.ones((N, D, len(MEALS)))
+    macros = np.broadcast_to(base, (N, D, len(MEALS), 4)).copy()
+    total = macros[..., 0].sum(axis=2)                                          # (N,D)
+
+    # 1) snack
+    s_cal = macros[:, :, 3, 0]
+    need = (np.abs(T - total) > 50) & (s_cal > 0)
+    f_s = np.maximum(0.2, (s_cal + (T - total)) / np.where(s_cal > 0, s_cal, 1.0))
+    factor[:, :, 3] = np.where(need, f_s, 1.0)
+    macros[:, :, 3, :] = np.where(need[..., None], np.round(macros[:, :, 3, :] * factor[:, :, 3, None], 1), macros[:, :, 3, :])
+    total2 = macros[..., 0].sum(axis=2)
+
+    # 2) dinner, only for days that were off target to begin with
+    d_cal = macros[:, :, 2, 0]
+    need_d = (np.abs(T - total) > 50) & (np.abs(total2 - T) > 50) & (d_cal > 0)
+    f_d = np.maximum(0.5, (d_cal + (T - total2)) / np.where(d_cal > 0, d_cal, 1.0))
+    factor[:, :, 2] = np.where(need_d, f_d, 1.0)
+    macros[:, :, 2, :] = np.where(need_d[..., None], np.round(macros[:, :, 2, :] * factor[:, :, 2, None], 1), macros[:, :, 2, :])
+    day_tot = macros.sum(axis=2)                                                 # (N,D,4)
+    # Unscaled days keep the raw catalog total, as scale_day_to_target does
+    kcal = np.where(np.abs(T - total) <= 50, total, day_tot[..., 0])
+
+    prot_def = np.maximum(0.0, np.round(P - day_tot[..., 1], 1))
+    fat_def = np.maximum(0.0, np.round(F - day_tot[..., 3], 1))
+    shakes = np.ceil(prot_def / 25.0).astype(int)
+    surplus = np.where(gain, 0.0, np.maximum(0.0, kcal - T))
+    return {
+        "factor": factor,
+        "macros": macros,
+        "kcal": kcal,
+        "protein_deficit": prot_def,
+        "shakes": shakes,
+        "shake_kcal": (shakes * 25.0 * 4.0).astype(int),
+        "fat_deficit": fat_def,
+        "surplus": surplus,
+        "burn": {name: minutes_for_burn(surplus, W, met) for name, met in METS.items()},
+    }
@@ -0,0 +1,209 @@
+# Headless load test: many simulated app.py sessions via Streamlit's AppTest
+# (no browser, no server). Each session runs a realistic flow and every rerun
+# is timed.
+#
+#   python loadtest.py --sessions 50 --workers 4 --iterations 2
+#   python loadtest.py --sessions 200 --workers 8 --json loadtest.json
+#
+# AppTest swaps a global Runtime instance in and out around each run, so it is
+# not safe to drive from several threads. Instead every worker process keeps
+# its share of sessions alive at once and interleaves their reruns one at a
+# time, and the workers run in parallel. Each worker is therefore like its own
+# single-user server with its own st.cache_resource copies: total throughput
+# is the sum of independent processes, and latencies include no GIL or
+# shared-cache contention. Size one `streamlit run` process from the
+# per-worker figure, not the total.
+import os
+import json
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+import memstats
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+MEAL_KEYS = ["Breakfast","Lunch","Dinner","Snack"]
+SEARCHES = ["", "dal", "paneer", "rice", "idli", "chiken", "oats", "roti"]
+IF_LABEL = "Intermittent Fasting (16:8): IF day(s) to skip breakfast"
+
+def rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def by_label(elements, label):
+    for e in elements:
+        if e.label == label:
+            return e
+    raise KeyError(label)
+
+def flow(at, rng, iterations):
+    # Sets up widgets for the next rerun and yields its step name
+    yield "initial load"
+    for _ in range(iterations):
+        by_label(at.sidebar.number_input, "Weight (kg)").set_value(round(rng.uniform(45, 110), 1))
+        by_label(at.sidebar.selectbox, "Goal").set_value(rng.choice(["Maintain","Loss","Gain"]))
+        yield "change profile"
+        by_label(at.sidebar.selectbox, "Region").set_value(rng.choice(["North","South","East","West"]))
+        yield "change profile"
+
+        by_label(at.sidebar.button, "Generate / Refresh plan").click()
+        yield "generate"
+
+        # Swap a non-breakfast meal (breakfast may be skipped on IF days)
+        day = rng.randrange(len(at.session_state["raw_week"]))
+        at.selectbox(key=f"swap_sel_{day}").set_value(rng.choice(MEAL_KEYS[1:]))
+        yield "swap: pick meal"
+        at.text_input(key=f"swap_q_{day}").input(rng.choice(SEARCHES))
+        yield "swap: search"
+        # No button when the search has no matches
+        btns = [b for b in at.button if b.key == f"swap_btn_{day}"]
+        if btns:
+            btns[0].click()
+            yield "swap: apply"
+
+        by_label(at.sidebar.multiselect, IF_LABEL).set_value(rng.sample(range(1, 8), rng.randint(0, 3)))
+        yield "toggle IF days"
+
+        dl = at.get("download_button")
+        if dl and hasattr(dl[0], "click"):
+            dl[0].click()
+        yield "download CSV"
+
+        at.sidebar.radio[0].set_value("Workout Plan")
+        yield "workout plan"
+        at.sidebar.radio[0].set_value("Diet Plan")
+        yield "back to diet"
+
+def warm_up(iterations: int, timeout: float):
+    # One untimed session so imports, script compile, the catalog read and the
+    # cached DishIndex are paid before the RSS baseline is taken
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    for _ in flow(at, random.Random(-1), iterations):
+        at.run()
+    return at
+
+def run_worker(sids: list, iterations: int, timeout: float) -> dict:
+    os.chdir(os.path.dirname(APP))  # app.py reads meals.csv relative to cwd
+    warm = warm_up(iterations, timeout)  # kept alive so its state is in the baseline
+    rss0 = rss_mb()
+    t0 = time.perf_counter()
+    sessions = []
+    for sid in sids:
+        at = AppTest.from_file(APP, default_timeout=timeout)
+        sessions.append({"sid": sid, "at": at, "steps": flow(at, random.Random(sid), iterations),
+                         "timings": [], "error": None})
+    live = list(sessions)
+    while live:
+        for s in list(live):
+            try:
+                step = next(s["steps"])
+                t = time.perf_counter()
+                s["at"].run()
+                s["timings"].append((step, time.perf_counter() - t))
+                if len(s["at"].exception):
+                    raise RuntimeError(f"{step}: {s['at'].exception[0].value}")
+            except StopIteration:
+                live.remove(s)
+            except Exception as e:
+                s["error"] = f"{type(e).__name__}: {e}"
+                live.remove(s)
+    elapsed = time.perf_counter() - t0
+    # Measured while every session in this worker is still alive
+    rss1 = rss_mb()
+    out = []
+    for s in sessions:
+        ss = s["at"].session_state
+        out.append({"sid": s["sid"], "timings": s["timings"], "error": s["error"],
+                    "session_bytes": memstats.approx_size({k: ss[k] for k in ss.keys()})})
+    del warm
+    return {"sessions": out, "rss_start_mb": rss0, "rss_peak_mb": rss1, "elapsed_s": elapsed,
+            "reruns": sum(len(s["timings"]) for s in sessions)}
+
+def percentiles(xs) -> dict:
+    a = np.asarray(xs) * 1000.0
+    return {"n": int(a.size), "p50_ms": float(np.percentile(a, 50)), "p95_ms": float(np.percentile(a, 95)),
+            "p99_ms": float(np.percentile(a, 99)), "max_ms": float(a.max())}
+
+def run_load(sessions: int, workers: int, iterations: int, timeout: float) -> dict:
+    workers = max(1, min(workers, sessions))
+    chunks = [list(range(sessions))[w::workers] for w in range(workers)]
+    t = time.perf_counter()
+    done = []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = [ex.submit(run_worker, c, iterations, timeout) for c in chunks]
+        for f in as_completed(futs):
+            done.append(f.result())
+            print(f"\rworkers done: {len(done)}/{workers}", end="", flush=True)
+    wall = time.perf_counter() - t
+    print()
+
+    results = [r for w in done for r in w["sessions"]]
+    all_t = [dt for r in results for _, dt in r["timings"]]
+    by_step = {}
+    for r in results:
+        for step, dt in r["timings"]:
+            by_step.setdefault(step, []).append(dt)
+    sess_bytes = [r["session_bytes"] for r in results]
+    # Peak-RSS growth after warm-up, divided by the sessions alive in that worker
+    rss_per_session = [(w["rss_peak_mb"] - w["rss_start_mb"]) * 1024 / len(w["sessions"]) for w in done]
+    return {
+        "sessions": sessions, "workers": workers, "iterations": iterations,
+        "wall_s": wall,
+        "reruns": len(all_t),
+        # Sum over independent worker processes, not one server
+        "throughput_reruns_per_s": len(all_t) / wall if wall else 0.0,
+        # What a single streamlit process (one Runtime, sessions served serially) sustained
+        "throughput_per_worker_reruns_per_s": float(np.mean([w["reruns"] / w["elapsed_s"] for w in done if w["elapsed_s"]])),
+        "sessions_per_s": sessions / wall if wall else 0.0,
+        "latency": percentiles(all_t) if all_t else None,
+        "latency_by_step": {k: percentiles(v) for k, v in by_step.items()},
+        "session_state_kib": {"mean": float(np.mean(sess_bytes)) / 1024, "max": float(np.max(sess_bytes)) / 1024},
+        "worker_peak_rss_mb": max(w["rss_peak_mb"] for w in done),
+        "peak_rss_delta_per_session_kib": float(np.mean(rss_per_session)),
+        "errors": [f"session {r['sid']}: {r['error']}" for r in results if r["error"]],
+    }
+
+def print_report(rep: dict):
+    print(f"{rep['sessions']} sessions x {rep['iterations']} iteration(s) on {rep['workers']} worker(s): "
+          f"{rep['reruns']} reruns in {rep['wall_s']:.1f}s")
+    print(f"Throughput: {rep['throughput_per_worker_reruns_per_s']:.1f} reruns/s per worker process; "
+          f"{rep['throughput_reruns_per_s']:.1f} reruns/s, {rep['sessions_per_s']:.2f} sessions/s total over {rep['workers']} worker(s)")
+    print("Note: each worker is an independent single-user process with its own caches. The total adds them up and "
+          "latencies exclude GIL/shared-cache contention, so size one `streamlit run` process from the per-worker figure.")
+    if rep["latency"]:
+        L = rep["latency"]
+        print(f"Rerun latency: p50 {L['p50_ms']:.0f} ms • p95 {L['p95_ms']:.0f} ms • p99 {L['p99_ms']:.0f} ms • max {L['max_ms']:.0f} ms")
+    print(f"{'Step':<18}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for step, L in rep["latency_by_step"].items():
+        print(f"{step:<18}{L['n']:>6}{L['p50_ms']:>9.0f}{L['p95_ms']:>9.0f}{L['p99_ms']:>9.0f}")
+    print(f"Session state: mean {rep['session_state_kib']['mean']:.1f} KiB, max {rep['session_state_kib']['max']:.1f} KiB")
+    print(f"Worker peak RSS: {rep['worker_peak_rss_mb']:.0f} MB (peak-RSS delta after warm-up ~{rep['peak_rss_delta_per_session_kib']:.0f} KiB per live session)")
+    if rep["errors"]:
+        print(f"{len(rep['errors'])} session(s) failed, first: {rep['errors'][0]}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Headless load test for app.py")
+    ap.add_argument("--sessions", type=int, default=20)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="parallel worker processes")
+    ap.add_argument("--iterations", type=int, default=1, help="flow repetitions per session")
+    ap.add_argument("--timeout", type=float, default=60.0, help="per-rerun timeout (s)")
+    ap.add_argument("--json", help="also write the report to this file")
+    args = ap.parse_args()
+
+    rep = run_load(args.sessions, args.workers, args.iterations, args.timeout)
+    print_report(rep)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rep, f, indent=2)
+    raise SystemExit(1 if rep["errors"] else 0)
@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import threading
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import numpy as np
+import streamlit as st
+
+# Opt-in: MEALPLANNER_MEMDEBUG=1 streamlit run app.py
+ENABLED = os.environ.get("MEALPLANNER_MEMDEBUG", "").lower() not in ("", "0", "false", "no")
+TOP_N = 10
+
+# tracemalloc is process-wide, so diffs are shared by every session in the worker
+_diffs = deque(maxlen=50)
+_lock = threading.Lock()
+
+SWAP_WIDGET_PREFIXES = ("swap_sel_", "swap_q_", "alt_name_", "swap_btn_")
+
+def approx_size(obj, _seen=None) -> int:
+    # Deep-ish size in bytes; pandas/numpy report their own buffers
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approx_size(k, _seen) + approx_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(approx_size(x, _seen) for x in obj)
+    elif hasattr(obj, "__dict__"):
+        size += approx_size(vars(obj), _seen)
+    return int(size)
+
+def session_sizes(session_state) -> list:
+    # One row per session_state key; swap widgets are grouped into a single row
+    rows = []
+    swap_bytes, swap_count = 0, 0
+    for key in list(session_state.keys()):
+        try:
+            val = session_state[key]
+        except KeyError:
+            continue
+        b = approx_size(val)
+        if str(key).startswith(SWAP_WIDGET_PREFIXES):
+            swap_bytes += b
+            swap_count += 1
+        else:
+            rows.append({"Key": str(key), "Type": type(val).__name__, "Bytes": b})
+    if swap_count:
+        rows.append({"Key": f"swap widgets ({swap_count})", "Type": "widgets", "Bytes": swap_bytes})
+    return sorted(rows, key=lambda r: -r["Bytes"])
+
+@contextmanager
+def traced(label: str):
+    # Records a tracemalloc snapshot diff around the block when ENABLED
+    if not ENABLED:
+        yield
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    try:
+        yield
+    finally:
+        after = tracemalloc.take_snapshot()
+        stats = after.compare_to(before, "lineno")
+        entry = {
+            "label": label,
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "net_bytes": int(sum(s.size_diff for s in stats)),
+            "top": [
+                {"where": str(s.traceback[0]), "size_diff": int(s.size_diff), "count_diff": int(s.count_diff)}
+                for s in stats[:TOP_N]
+            ],
+        }
+        with _lock:
+            _diffs.append(entry)
+
+def recent_diffs() -> list:
+    with _lock:
+        return list(_diffs)
+
+def build_report(session_state, catalog=None) -> dict:
+    rows = session_sizes(session_state)
+    report = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "session": rows,
+        "session_total_bytes": sum(r["Bytes"] for r in rows),
+        "catalog_bytes": approx_size(catalog) if catalog is not None else None,
+        # catalog may be {name: obj} to break shared structures out
+        "catalog_parts": {k: approx_size(v) for k, v in catalog.items()} if isinstance(catalog, dict) else None,
+        "tracemalloc": None,
+        "diffs": recent_diffs(),
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        report["tracemalloc"] = {"current_bytes": current, "peak_bytes": peak}
+    return report
+
+def dump_report(session_state, catalog=None) -> str:
+    return json.dumps(build_report(session_state, catalog), indent=2)
+
+def render_panel(session_state, catalog=None):
+    # Sidebar debug panel; the JSON download is the same report that is shown
+    report = build_report(session_state, catalog)
+    with st.sidebar.expander("🧠 Memory debug"):
+        caption = f"Session total: **{report['session_total_bytes']/1024:.1f} KiB**"
+        if report["catalog_bytes"] is not None:
+            caption += f" • Catalog: **{report['catalog_bytes']/1024:.1f} KiB**"
+        if report["catalog_parts"]:
+            caption += " (" + ", ".join(f"{k} {v/1024:.1f} KiB" for k, v in report["catalog_parts"].items()) + ")"
+        st.caption(caption)
+        st.dataframe(pd.DataFrame(report["session"]), use_container_width=True)
+        if report["tracemalloc"]:
+            st.caption(f"tracemalloc current {report['tracemalloc']['current_bytes']/1024:.1f} KiB, "
+                       f"peak {report['tracemalloc']['peak_bytes']/1024:.1f} KiB")
+        for d in reversed(report["diffs"][-5:]):
+            st.markdown(f"**{d['label']}** ({d['time']}) → net {d['net_bytes']/1024:+.1f} KiB")
+            st.dataframe(pd.DataFrame(d["top"]), use_container_width=True)
+        st.download_button("⬇️ Memory report (JSON)", json.dumps(report, indent=2),
+                           "memory_report.json", "application/json")